@@ -1,63 +1,71 @@
-import os, random
+import os
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.csv as pac
 
 def generate_sample_data(raw_dir="data/raw", seed=7):
-    random.seed(seed)
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
 
     os.makedirs(raw_dir, exist_ok=True)
 
     regions = ["North", "South", "East", "West"]
     products = ["Laptop", "Phone", "Headphones", "Camera", "Smartwatch", "Tablet"]
     payment_methods = ["UPI", "Card", "COD", "Wallet"]
+    base_prices = np.array([60000, 30000, 3000, 45000, 8000, 20000], dtype=float)
 
-    start = datetime(2025, 1, 1)
-    rows = []
-    oid = 100000
+    # ~6 months, avg 40 orders/day
+    days = np.datetime64("2025-01-01") + np.arange(180)
+    counts = rng.poisson(40, size=len(days))
+    n = int(counts.sum())
 
-    for day in range(180):  # ~6 months
-        d = start + timedelta(days=day)
-        for _ in range(np.random.poisson(40)):  # avg 40 orders/day
-            product = random.choice(products)
-            qty = max(1, int(np.random.exponential(1.2)))
-            base_price = {
-                "Laptop": 60000, "Phone": 30000, "Headphones": 3000,
-                "Camera": 45000, "Smartwatch": 8000, "Tablet": 20000
-            }[product]
-            unit_price = float(np.random.normal(base_price, base_price*0.08))
-            discount = float(max(0, min(0.35, np.random.beta(2,8))))
-            region = random.choice(regions)
-            pm = random.choice(payment_methods)
-            rows.append({
-                "order_id": oid,
-                "date": d.strftime("%Y-%m-%d"),
-                "region": region,
-                "product": product,
-                "quantity": qty,
-                "unit_price": round(unit_price,2),
-                "discount": round(discount,2),
-                "payment_method": pm
-            })
-            oid += 1
+    # Categorical draws as small int codes, gathered into labels once below
+    product_idx = rng.integers(0, len(products), n, dtype=np.int8)
+    region_idx = rng.integers(0, len(regions), n, dtype=np.int8)
+    pm_idx = rng.integers(0, len(payment_methods), n, dtype=np.int8)
 
-    df = pd.DataFrame(rows)
+    qty = np.maximum(1, rng.exponential(1.2, n).astype(int))
+    base_price = base_prices[product_idx]
+    unit_price = rng.normal(base_price, base_price * 0.08)
+    discount = np.clip(rng.beta(2, 8, n), 0, 0.35)
+
+    columns = {
+        "order_id": np.arange(100000, 100000 + n),
+        "date": np.repeat(days, counts).astype(str),
+        "region": np.array(regions, dtype=object)[region_idx],
+        "product": np.array(products, dtype=object)[product_idx],
+        "quantity": qty,
+        "unit_price": np.round(unit_price, 2),
+        "discount": np.round(discount, 2),
+        "payment_method": np.array(payment_methods, dtype=object)[pm_idx],
+    }
 
     # introduce missing values
-    mask = np.random.rand(len(df)) < 0.01
-    df.loc[mask, "discount"] = np.nan
-    mask = np.random.rand(len(df)) < 0.005
-    df.loc[mask, "region"] = None
+    columns["discount"][rng.random(n) < 0.01] = np.nan
+    columns["region"][rng.random(n) < 0.005] = None
+
+    # duplicate some rows (appended per column, before the frame is built)
+    dup_idx = rng.choice(n, size=100, replace=False)
+    df = pd.DataFrame({c: np.concatenate([arr, arr[dup_idx]]) for c, arr in columns.items()})
 
-    # duplicate some rows
-    dup_idx = np.random.choice(df.index, size=100, replace=False)
-    df = pd.concat([df, df.loc[dup_idx]], ignore_index=True)
+    # Save in multiple formats: shuffle once, then take consecutive windows
+    # of the permutation (wrapping around, so the parts partly overlap)
+    perm = rng.permutation(len(df))
+    ends = (np.cumsum([0.5, 0.3, 0.4]) * len(df)).astype(int)
+    part_a, part_b, part_c = (
+        df.iloc[perm.take(np.arange(start, end), mode="wrap")]
+        for start, end in zip([0, *ends[:-1]], ends)
+    )
+    pac.write_csv(pa.Table.from_pandas(part_a, preserve_index=False), os.path.join(raw_dir, "sales_part_a.csv"))
+    part_b.to_json(os.path.join(raw_dir, "sales_part_b.json"), orient="records", lines=True)
+    part_c.to_parquet(os.path.join(raw_dir, "sales_part_c.parquet"), index=False)
 
-    # Save in multiple formats
-    df.sample(frac=0.5, random_state=1).to_csv(os.path.join(raw_dir, "sales_part_a.csv"), index=False)
-    df.sample(frac=0.3, random_state=2).to_json(os.path.join(raw_dir, "sales_part_b.json"), orient="records", lines=True)
-    df.sample(frac=0.4, random_state=3).to_excel(os.path.join(raw_dir, "sales_part_c.xlsx"), index=False)
+    # sales_part_c used to be written as Excel; a leftover copy would be merged
+    # alongside the new Parquet split by the pipeline
+    stale = os.path.join(raw_dir, "sales_part_c.xlsx")
+    if os.path.exists(stale):
+        os.remove(stale)
+        print(f"Removed stale {stale}")
 
     print(f"✅ Synthetic data generated in {raw_dir}")
 
@@ -1,42 +1,174 @@
 import os
+import glob
+import functools
+import hashlib
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pac
+import pyarrow.json as paj
+import pyarrow.parquet as pq
+import matplotlib
+matplotlib.use("Agg")  # file output only; skip GUI backend selection
 import matplotlib.pyplot as plt
-import seaborn as sns
 from tabulate import tabulate
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, LongTable, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    from json import loads as _json_loads
+
+
+# Below this many rows the NumPy path beats importing numba and loading (or
+# compiling) the kernel.
+NUMBA_MIN_ROWS = 10_000_000
+# Values that are NaN, infinite or outside these ranges would wrap or
+# overflow on the downcast, so both kernels treat them as missing (0).
+_INT32_MIN = float(np.iinfo(np.int32).min)
+_INT32_MAX = float(np.iinfo(np.int32).max)
+_FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+
+def _clean_numpy(q_in, p_in, d_in, q_out, p_out, d_out, rev_out):
+    q_out[:] = np.where((q_in >= _INT32_MIN) & (q_in <= _INT32_MAX), q_in, 0.0)
+    p_out[:] = np.where(np.abs(p_in) <= _FLOAT32_MAX, p_in, 0.0)
+    d_out[:] = np.where(np.abs(d_in) <= _FLOAT32_MAX, d_in, 0.0)
+    np.multiply(q_out, p_out, out=rev_out)
+    rev_out *= 1.0 - d_out.astype(np.float64)
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_clean_kernel():
+    """Return the JIT clean kernel (compiled once, then loaded from numba's on-disk cache).
+
+    Returns None when numba is not installed; it is an optional dependency.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    # Only FMA contraction is allowed: full fastmath would let LLVM assume
+    # no NaNs/infs and drop the range checks. NaN fails every comparison.
+    @njit(cache=True, fastmath={"contract"})
+    def kernel(q_in, p_in, d_in, q_out, p_out, d_out, rev_out):
+        for i in range(q_in.size):
+            qv, pv, dv = q_in[i], p_in[i], d_in[i]
+            q = np.int32(qv) if _INT32_MIN <= qv <= _INT32_MAX else np.int32(0)
+            p = np.float32(pv) if abs(pv) <= _FLOAT32_MAX else np.float32(0.0)
+            d = np.float32(dv) if abs(dv) <= _FLOAT32_MAX else np.float32(0.0)
+            q_out[i] = q
+            p_out[i] = p
+            d_out[i] = d
+            rev_out[i] = q * p * (1.0 - d)
+
+    return kernel
+
+
+def _clean_kernel(q_in, p_in, d_in, q_out, p_out, d_out, rev_out):
+    kernel = _numba_clean_kernel() if q_in.size >= NUMBA_MIN_ROWS else None
+    (kernel or _clean_numpy)(q_in, p_in, d_in, q_out, p_out, d_out, rev_out)
+
+SUPPORTED_EXTENSIONS = (".csv", ".json", ".parquet", ".xlsx")
+REQUIRED_COLUMNS = {"order_id", "date", "region", "product", "quantity", "unit_price", "discount"}
+# Only these columns are ever used downstream; anything else is dropped at read time.
+USED_COLUMNS = REQUIRED_COLUMNS | {"payment_method"}
+# Keep CSV dates as text at read time, so they reach clean_and_transform as
+# YYYY-MM-DD strings instead of Arrow date32 objects.
+DATE_AS_STRING = {"date": pa.string()}
+
+
+def _used(names):
+    return [c for c in names if c in USED_COLUMNS]
+
+
+def _date_as_string(table: pa.Table) -> pa.Table:
+    """Render an inferred date/timestamp "date" column back to %Y-%m-%d text, if present.
+
+    Numeric dates are taken as epoch milliseconds, pandas' default to_json date format.
+    """
+    if "date" not in table.column_names:
+        return table
+    col = table["date"]
+    if pa.types.is_integer(col.type) or pa.types.is_floating(col.type):
+        col = col.cast(pa.int64()).cast(pa.timestamp("ms"))
+    if pa.types.is_temporal(col.type):
+        col = pc.strftime(col, format="%Y-%m-%d")
+    elif not pa.types.is_string(col.type):
+        col = col.cast(pa.string())
+    return table.set_column(table.column_names.index("date"), "date", col)
+
+
+def _read_json_records(path: str) -> pd.DataFrame:
+    """Read a JSON array of records, assembling the DataFrame column by column."""
+    with open(path, "rb") as f:
+        records = _json_loads(f.read())
+    if not isinstance(records, list):
+        df = pd.read_json(path)
+        return df[_used(df.columns)]
+    names = _used(dict.fromkeys(k for r in records for k in r))
+    df = pd.DataFrame({c: [r.get(c) for r in records] for c in names})
+    if "date" in df.columns and pd.api.types.is_numeric_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], unit="ms")  # epoch ms, as written by to_json
+    return df
+
+
+def _read_one(path: str):
+    """Read a single raw file and return (file, df), with df None if it could not be read."""
+    file = os.path.basename(path)
+    try:
+        if file.endswith(".csv"):
+            with pac.open_csv(path) as reader:
+                header = reader.schema.names
+            opts = pac.ConvertOptions(
+                strings_can_be_null=True, include_columns=_used(header), column_types=DATE_AS_STRING
+            )
+            df = pac.read_csv(path, convert_options=opts).to_pandas(types_mapper=pd.ArrowDtype)
+        elif file.endswith(".json"):
+            try:
+                table = _date_as_string(paj.read_json(path))  # JSONL
+                df = table.select(_used(table.column_names)).to_pandas(types_mapper=pd.ArrowDtype)
+            except Exception:
+                df = _read_json_records(path)  # Normal JSON
+        elif file.endswith(".parquet"):
+            df = pd.read_parquet(path, engine="pyarrow", columns=_used(pq.read_schema(path).names))
+        else:
+            df = pd.read_excel(path, usecols=lambda c: c in USED_COLUMNS)
+    except Exception as e:
+        print(f"[PIPELINE] Could not read {file}: {e}")
+        return file, None
+    return file, df
+
+
 def load_and_merge_datasets(raw_dir: str) -> pd.DataFrame:
-    """Load CSV, JSON, and Excel files from raw_dir and merge into a single DataFrame."""
-    import os
-    import pandas as pd
+    """Load CSV, JSON, Parquet, and Excel files from raw_dir and merge into a single DataFrame.
 
+    Files are read concurrently; the pyarrow readers release the GIL while parsing.
+    Only USED_COLUMNS are materialized from each file.
+    """
     frames = []
-    required = {"order_id", "date", "region", "product", "quantity", "unit_price", "discount"}
 
+    paths = []
     for file in os.listdir(raw_dir):
-        path = os.path.join(raw_dir, file)
-        try:
-            if file.endswith(".csv"):
-                df = pd.read_csv(path)
-            elif file.endswith(".json"):
-                try:
-                    df = pd.read_json(path, lines=True)  # JSONL
-                except Exception:
-                    df = pd.read_json(path)  # Normal JSON
-            elif file.endswith(".xlsx"):
-                df = pd.read_excel(path)
-            else:
-                print(f"[PIPELINE] Skipping unsupported file {file}")
-                continue
-        except Exception as e:
-            print(f"[PIPELINE] Could not read {file}: {e}")
+        if not file.endswith(SUPPORTED_EXTENSIONS):
+            print(f"[PIPELINE] Skipping unsupported file {file}")
+            continue
+        paths.append(os.path.join(raw_dir, file))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(paths)))) as ex:
+        results = list(ex.map(_read_one, paths))
+
+    for file, df in results:
+        if df is None:
             continue
-        if not required.issubset(df.columns):
-            missing = required - set(df.columns)
+        if not REQUIRED_COLUMNS.issubset(df.columns):
+            missing = REQUIRED_COLUMNS - set(df.columns)
             print(f"[PIPELINE] Skipping {file} (missing {missing})")
             continue
 
@@ -50,15 +182,44 @@ def load_and_merge_datasets(raw_dir: str) -> pd.DataFrame:
 
 # Data Cleaning
 
-def clean_and_transform(df: pd.DataFrame) -> pd.DataFrame:
-    """Clean and transform sales data."""
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce").fillna(0).astype(int)
-    df["unit_price"] = pd.to_numeric(df["unit_price"], errors="coerce").fillna(0.0)
-    df["discount"] = pd.to_numeric(df["discount"], errors="coerce").fillna(0.0)
-
-    df["revenue"] = df["quantity"] * df["unit_price"] * (1 - df["discount"])
+def clean_and_transform(df: pd.DataFrame, copy: bool = False) -> pd.DataFrame:
+    """Clean and transform sales data.
+
+    Columns are overwritten in place on the input frame unless copy=True.
+    """
+    if copy:
+        df = df.copy()
+    # Fast path for the plain YYYY-MM-DD dates the readers normally produce;
+    # anything else (e.g. full ISO 8601 timestamps, possibly with offsets) is
+    # re-parsed on its own and normalized to naive UTC.
+    dates = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce", cache=True)
+    retry = dates.isna() & df["date"].notna()
+    if retry.any():
+        iso = pd.to_datetime(df["date"][retry], format="ISO8601", errors="coerce", utc=True)
+        dates[retry] = iso.dt.tz_convert(None)
+    df["date"] = dates
+
+    # Missing-value fill, downcast and revenue run as one fused pass over the
+    # coerced inputs. Narrow dtypes halve the bytes streamed; revenue itself
+    # stays float64 so the report totals keep full precision.
+    q_in, p_in, d_in = (
+        pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        for c in ("quantity", "unit_price", "discount")
+    )
+    n = len(df)
+    q_out = np.empty(n, dtype=np.int32)
+    p_out = np.empty(n, dtype=np.float32)
+    d_out = np.empty(n, dtype=np.float32)
+    rev_out = np.empty(n, dtype=np.float64)
+    _clean_kernel(q_in, p_in, d_in, q_out, p_out, d_out, rev_out)
+    df["quantity"] = q_out
+    df["unit_price"] = p_out
+    df["discount"] = d_out
+    for c in ("region", "product", "payment_method"):
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    df["month"] = df["date"].values.astype("datetime64[M]")
+    df["revenue"] = rev_out
 
     return df
 
@@ -66,46 +227,59 @@ def clean_and_transform(df: pd.DataFrame) -> pd.DataFrame:
 
 # EDA & Reports
 
+def _sum_by(keys: pd.Series, revenue: np.ndarray) -> pd.DataFrame:
+    """Sum revenue per distinct key (sorted, missing keys dropped) using np.bincount."""
+    codes, uniques = pd.factorize(keys, sort=True)
+    valid = codes >= 0
+    sums = np.bincount(codes[valid], weights=revenue[valid], minlength=len(uniques))
+    return pd.DataFrame({keys.name: uniques, "revenue": sums})
+
 def analyze_sales(df: pd.DataFrame, out_dir: str):
     """Perform EDA and save reports & plots."""
     os.makedirs(out_dir, exist_ok=True)
 
+    # Each report is one factorize + np.bincount over this shared array (see _sum_by).
+    rev = df["revenue"].to_numpy()
+
     # 1. Monthly sales
-    monthly = df.groupby(df["date"].dt.to_period("M")).agg({"revenue": "sum"}).reset_index()
-    monthly["date"] = monthly["date"].astype(str)
+    monthly = _sum_by(df["month"], rev)
+    monthly.insert(0, "date", monthly.pop("month").dt.strftime("%Y-%m"))
     monthly.to_csv(os.path.join(out_dir, "monthly_sales.csv"), index=False)
 
     # 2. Regional sales
-    regional = df.groupby("region").agg({"revenue": "sum"}).reset_index()
+    regional = _sum_by(df["region"], rev)
     regional.to_csv(os.path.join(out_dir, "regional_sales.csv"), index=False)
 
     # 3. Product sales
-    product = df.groupby("product").agg({"revenue": "sum"}).reset_index()
+    product = _sum_by(df["product"], rev)
     product.to_csv(os.path.join(out_dir, "product_sales.csv"), index=False)
 
-    # Plots
-
-    plt.figure(figsize=(8, 4))
-    sns.lineplot(x="date", y="revenue", data=monthly, marker="o")
-    plt.title("Monthly Sales Trend")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(os.path.join(out_dir, "monthly_trend.png"))
-    plt.close()
-
-    plt.figure(figsize=(6, 4))
-    sns.barplot(x="region", y="revenue", data=regional)
-    plt.title("Regional Sales")
-    plt.tight_layout()
-    plt.savefig(os.path.join(out_dir, "regional_sales.png"))
-    plt.close()
-
-    plt.figure(figsize=(6, 4))
-    sns.barplot(x="product", y="revenue", data=product)
-    plt.title("Product Sales")
-    plt.tight_layout()
-    plt.savefig(os.path.join(out_dir, "product_sales.png"))
-    plt.close()
+    # Plots (one figure reused for all three charts)
+
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.plot(monthly["date"], monthly["revenue"], marker="o")
+    ax.set(xlabel="date", ylabel="revenue")
+    ax.set_title("Monthly Sales Trend")
+    ax.tick_params(axis="x", rotation=45)
+    fig.tight_layout()
+    fig.savefig(os.path.join(out_dir, "monthly_trend.png"))
+
+    ax.clear()
+    ax.tick_params(axis="x", rotation=0)  # tick_params survive ax.clear()
+    fig.set_size_inches(6, 4)
+    ax.bar(regional["region"].astype(str), regional["revenue"])
+    ax.set(xlabel="region", ylabel="revenue")
+    ax.set_title("Regional Sales")
+    fig.tight_layout()
+    fig.savefig(os.path.join(out_dir, "regional_sales.png"))
+
+    ax.clear()
+    ax.bar(product["product"].astype(str), product["revenue"])
+    ax.set(xlabel="product", ylabel="revenue")
+    ax.set_title("Product Sales")
+    fig.tight_layout()
+    fig.savefig(os.path.join(out_dir, "product_sales.png"))
+    plt.close(fig)
 
     pdf_path = os.path.join(out_dir, "summary_report.pdf")
     doc = SimpleDocTemplate(pdf_path)
@@ -119,8 +293,7 @@ def analyze_sales(df: pd.DataFrame, out_dir: str):
     for name, table_df in [("Monthly Sales", monthly), ("Regional Sales", regional), ("Product Sales", product)]:
         flow.append(Paragraph(name, styles["Heading2"]))
         flow.append(Spacer(1, 6))
-        data = [table_df.columns.tolist()] + table_df.values.tolist()
-        table = Table(data)
+        table = LongTable([table_df.columns.tolist(), *table_df.to_numpy().tolist()], repeatRows=1)
         table.setStyle(TableStyle([
             ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
             ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
@@ -133,15 +306,47 @@ def analyze_sales(df: pd.DataFrame, out_dir: str):
     doc.build(flow)
     print(f"[PIPELINE] PDF report saved to {pdf_path}")
 
-# Running pipe line
+# Cleaned-data cache
 
-def run_pipeline(raw_dir: str, out_dir: str):
-    print(f"[PIPELINE] Loading raw data from {os.path.abspath(raw_dir)} ...")
-    df = load_and_merge_datasets(raw_dir)
-    print(f"[PIPELINE] Rows loaded: {len(df)}")
+# Bump whenever clean_and_transform (or the readers feeding it) changes the
+# cleaned output, so caches written by older code are not reused.
+CLEAN_CACHE_VERSION = 1
+CACHE_SUBDIR = ".cache"
+
+
+def _raw_signature(raw_dir: str) -> str:
+    """Hash the cache version plus the names, mtimes and sizes of the supported files in raw_dir."""
+    entries = [("version", CLEAN_CACHE_VERSION)]
+    for file in sorted(os.listdir(raw_dir)):
+        if file.endswith(SUPPORTED_EXTENSIONS):
+            st = os.stat(os.path.join(raw_dir, file))
+            entries.append((file, st.st_mtime_ns, st.st_size))
+    return hashlib.md5(repr(entries).encode()).hexdigest()
+
+# Running pipe line
 
-    print("[PIPELINE] Cleaning & transforming ...")
-    df = clean_and_transform(df)
+def run_pipeline(raw_dir: str, out_dir: str, use_cache: bool = True):
+    cache = None
+    cache_dir = os.path.join(out_dir, CACHE_SUBDIR)
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache = os.path.join(cache_dir, f"clean_{_raw_signature(raw_dir)}.parquet")
+
+    if cache and os.path.exists(cache):
+        print(f"[PIPELINE] Raw data unchanged, reading cleaned data from {cache}")
+        df = pd.read_parquet(cache)
+    else:
+        print(f"[PIPELINE] Loading raw data from {os.path.abspath(raw_dir)} ...")
+        df = load_and_merge_datasets(raw_dir)
+        print(f"[PIPELINE] Rows loaded: {len(df)}")
+
+        print("[PIPELINE] Cleaning & transforming ...")
+        df = clean_and_transform(df)
+
+        if cache:
+            for old in glob.glob(os.path.join(cache_dir, "clean_*.parquet")):
+                os.remove(old)
+            df.to_parquet(cache, index=False)
 
     print("[PIPELINE] Running analysis & reports ...")
     analyze_sales(df, out_dir)
@@ -153,9 +358,10 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--raw-dir", type=str, default="data/raw", help="Path to raw data")
     parser.add_argument("--out-dir", type=str, default="reports", help="Path to output reports")
+    parser.add_argument("--no-cache", action="store_true", help="Always reload and clean the raw data")
     args = parser.parse_args()
 
-    run_pipeline(args.raw_dir, args.out_dir)
+    run_pipeline(args.raw_dir, args.out_dir, use_cache=not args.no_cache)
 
 
 if __name__ == "__main__":